@@ -8,6 +8,7 @@ import os
 import sys
 import logging
 import argparse
+import functools
 import math
 
 from datetime import datetime
@@ -23,18 +24,29 @@ from litex.build.osfpga import OSFPGAPlatform
 from litex.soc.interconnect.axi import AXIInterface
 
 
+# Import Common Modules.
+common_path = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib"))
+if common_path not in sys.path:
+    sys.path.append(common_path)
+
+from common import IP_Builder, get_json_filename
+
 # IOs / Interface ----------------------------------------------------------------------------------
+CLKIN_A_IOS = (
+    ("a_clk", 0, Pins(1)),
+    ("a_rst", 0, Pins(1))
+)
+
+CLKIN_B_IOS = (
+    ("b_clk", 0, Pins(1)),
+    ("b_rst", 0, Pins(1))
+)
+
 def get_clkin_a_ios():
-    return [
-        ("a_clk", 0, Pins(1)),
-        ("a_rst", 0, Pins(1))
-    ]
+    return CLKIN_A_IOS
     
 def get_clkin_b_ios():
-    return [
-        ("b_clk", 0, Pins(1)),
-        ("b_rst", 0, Pins(1))
-    ]
+    return CLKIN_B_IOS
     
 # AXI-DPRAM Wrapper --------------------------------------------------------------------------------
 class AXIDPRAMWrapper(Module):
@@ -56,11 +68,14 @@ class AXIDPRAMWrapper(Module):
             id_width        = id_width,
         )
         
+        # Combinatorial statements, added to self.comb once at the end.
+        comb_stmts = []
+
         platform.add_extension(s_axi_a.get_ios("s_axi_a"))
-        self.comb += s_axi_a.connect_to_pads(platform.request("s_axi_a"), mode="slave")
+        comb_stmts += s_axi_a.connect_to_pads(platform.request("s_axi_a"), mode="slave")
         
         platform.add_extension(s_axi_b.get_ios("s_axi_b"))
-        self.comb += s_axi_b.connect_to_pads(platform.request("s_axi_b"), mode="slave")
+        comb_stmts += s_axi_b.connect_to_pads(platform.request("s_axi_b"), mode="slave")
         
         # AXI-DPRAM -------------------------------------------------------------------------------
         self.submodules.dpram = dpram = AXIDPRAM(platform, s_axi_a, s_axi_b, 
@@ -71,43 +86,47 @@ class AXIDPRAMWrapper(Module):
             size                =   (2**addr_width)*(data_width/8)
             )
         
+        # Clocking --------------------------------------------------------------------------------
         platform.add_extension(get_clkin_a_ios())
-        self.comb += dpram.a_clk.eq(platform.request("a_clk"))
-        self.comb += dpram.a_rst.eq(platform.request("a_rst"))
-        
         platform.add_extension(get_clkin_b_ios())
-        self.comb += dpram.b_clk.eq(platform.request("b_clk"))
-        self.comb += dpram.b_rst.eq(platform.request("b_rst"))
+        a_clk = platform.request("a_clk")
+        a_rst = platform.request("a_rst")
+        b_clk = platform.request("b_clk")
+        b_rst = platform.request("b_rst")
+        comb_stmts += [
+            dpram.a_clk.eq(a_clk),
+            dpram.a_rst.eq(a_rst),
+            dpram.b_clk.eq(b_clk),
+            dpram.b_rst.eq(b_rst),
+        ]
+
+        self.comb += comb_stmts
+
+# Parameter Dependency dictionary
+#                Ports     :    Dependency
+dep_dict = {}
+
+# Parameter Choices dictionary (validated by argparse)
+#                Ports     :    Choices
+choices_dict = {
+    "data_width"    :   [8, 16, 32, 64, 128, 256],
+    "addr_width"    :   range(8, 17),
+    "id_width"      :   range(1, 33),
+}
 
 # Build --------------------------------------------------------------------------------------------
-def main():
+@functools.lru_cache(maxsize=1)
+def build_parser():
     parser = argparse.ArgumentParser(description="AXI DPRAM CORE")
 
-    # Import Common Modules.
-    common_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib")
-    sys.path.append(common_path)
-
-    from common import IP_Builder
-
-    # Parameter Dependency dictionary
-    #                Ports     :    Dependency
-    dep_dict = {}            
-
-    # IP Builder.
-    rs_builder = IP_Builder(device="gemini", ip_name="axi_dpram", language="verilog")
-
-    logging.info("===================================================")
-    logging.info("IP    : %s", rs_builder.ip_name.upper())
-    logging.info(("==================================================="))
-    
     # Core fix value parameters.
     core_fix_param_group = parser.add_argument_group(title="Core fix parameters")
-    core_fix_param_group.add_argument("--data_width",   type=int,   default=32,     choices=[8, 16, 32, 64, 128, 256], help="DPRAM Data Width.")
+    core_fix_param_group.add_argument("--data_width",   type=int,   default=32,     choices=choices_dict["data_width"],   help="DPRAM Data Width.")
 
     # Core range value parameters.
     core_range_param_group = parser.add_argument_group(title="Core range parameters")
-    core_range_param_group.add_argument("--addr_width",     type=int,      default=16,      choices=range(8, 17),     help="DPRAM Address Width.")
-    core_range_param_group.add_argument("--id_width",       type=int,      default=32,      choices=range(1, 33),     help="DPRAM ID Width.")
+    core_range_param_group.add_argument("--addr_width",     type=int,      default=16,      choices=choices_dict["addr_width"],   help="DPRAM Address Width.")
+    core_range_param_group.add_argument("--id_width",       type=int,      default=32,      choices=choices_dict["id_width"],     help="DPRAM ID Width.")
     
     # Core bool value parameters.
     core_bool_param_group = parser.add_argument_group(title="Core bool parameters")
@@ -127,7 +146,23 @@ def main():
     json_group.add_argument("--json",                                    help="Generate Core from JSON File")
     json_group.add_argument("--json-template",  action="store_true",     help="Generate JSON Template")
 
-    args = parser.parse_args()
+    return parser
+
+def main():
+    # IP Builder.
+    rs_builder = IP_Builder(device="gemini", ip_name="axi_dpram", language="verilog")
+
+    logging.info("===================================================")
+    logging.info("IP    : %s", rs_builder.ip_name.upper())
+    logging.info(("==================================================="))
+
+    # Parse arguments once; JSON values (if any) are pre-loaded as defaults for the command line.
+    parser        = build_parser()
+    json_filename = get_json_filename()
+    if json_filename:
+        args = rs_builder.import_args_from_json(parser=parser, json_filename=json_filename)
+    else:
+        args = parser.parse_args()
     
     details =  {   "IP details": {
     'Name' : 'AXI Dual Port RAM',
@@ -138,7 +173,6 @@ def main():
 
     # Import JSON (Optional) -----------------------------------------------------------------------
     if args.json:
-        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json)
         rs_builder.import_ip_details_json(build_dir=args.build_dir ,details=details , build_name = args.build_name, version = "v1_0")
 
         file_path = os.path.dirname(os.path.realpath(__file__))
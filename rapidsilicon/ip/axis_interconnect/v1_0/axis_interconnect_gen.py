@@ -8,7 +8,7 @@ import os
 import sys
 import logging
 import argparse
-import math
+import functools
 from pathlib import Path
 
 from datetime import datetime
@@ -23,17 +23,27 @@ from litex.build.osfpga import OSFPGAPlatform
 
 from litex.soc.interconnect.axi import AXIStreamInterface
 
+# Import Common Modules.
+common_path = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib"))
+if common_path not in sys.path:
+    sys.path.append(common_path)
+
+from common import IP_Builder, get_json_filename
+
 # IOs/Interfaces -----------------------------------------------------------------------------------
+CLKIN_IOS = (
+    ("clk",  0, Pins(1)),
+    ("rst",  0, Pins(1)),
+)
+
 def get_clkin_ios():
-    return [
-        ("clk",  0, Pins(1)),
-        ("rst",  0, Pins(1)),
-    ]
+    return CLKIN_IOS
 
+@functools.lru_cache(maxsize=None)
 def get_control_ios(select_width, m_count):
-    return [
-        ("m{}_select".format(m_count), 0, Pins(select_width))
-    ]
+    return tuple(
+        ("m{}_select".format(i), 0, Pins(select_width)) for i in range(m_count)
+    )
     
 # AXIS_INTERCONNECT Wrapper ----------------------------------------------------------------------------------
 class AXISTREAMINTERCONNECTWrapper(Module):
@@ -43,37 +53,42 @@ class AXISTREAMINTERCONNECTWrapper(Module):
         # Clocking ---------------------------------------------------------------------------------
         platform.add_extension(get_clkin_ios())
         self.clock_domains.cd_sys  = ClockDomain()
-        self.comb += self.cd_sys.clk.eq(platform.request("clk"))
-        self.comb += self.cd_sys.rst.eq(platform.request("rst"))
+
+        # Combinatorial statements, added to self.comb once at the end.
+        comb_stmts = [
+            self.cd_sys.clk.eq(platform.request("clk")),
+            self.cd_sys.rst.eq(platform.request("rst")),
+        ]
         
         # Keep Width, Select_width Calculation
         keep_width      = int((data_width+7)/8)
-        select_width    = math.ceil(math.log2(s_count))
+        select_width    = max(1, (s_count - 1).bit_length())
         
+        # AXI-Stream Interface Parameters (shared by all Slave/Master Interfaces)
+        axis_kwargs = dict(
+            data_width  = data_width,
+            user_width  = user_width,
+            id_width    = id_width,
+            dest_width  = dest_width,
+            keep_width  = keep_width,
+        )
+
         # Slave Interfaces
         s_axiss = []
-        for s_count in range(s_count):
-            s_axis = AXIStreamInterface(data_width = data_width , user_width = user_width, id_width = id_width, dest_width = dest_width, keep_width = keep_width)
-            if s_count>9:
-                platform.add_extension(s_axis.get_ios("s{}_axis".format(s_count)))
-                self.comb += s_axis.connect_to_pads(platform.request("s{}_axis".format(s_count)), mode="slave")
-            else:
-                platform.add_extension(s_axis.get_ios("s0{}_axis".format(s_count)))
-                self.comb += s_axis.connect_to_pads(platform.request("s0{}_axis".format(s_count)), mode="slave")
-                
+        for i in range(s_count):
+            name   = f"s{i:02d}_axis"
+            s_axis = AXIStreamInterface(**axis_kwargs)
+            platform.add_extension(s_axis.get_ios(name))
+            comb_stmts += s_axis.connect_to_pads(platform.request(name), mode="slave")
             s_axiss.append(s_axis)
             
         # Master Interfaces
         m_axiss = []
-        for m_count in range(m_count):
-            m_axis = AXIStreamInterface(data_width = data_width , user_width = user_width, id_width = id_width, dest_width = dest_width, keep_width = keep_width)
-            if m_count>9:
-                platform.add_extension(m_axis.get_ios("m{}_axis".format(m_count)))
-                self.comb += m_axis.connect_to_pads(platform.request("m{}_axis".format(m_count)), mode="master")
-            else:
-                platform.add_extension(m_axis.get_ios("m0{}_axis".format(m_count)))
-                self.comb += m_axis.connect_to_pads(platform.request("m0{}_axis".format(m_count)), mode="master")
-                
+        for i in range(m_count):
+            name   = f"m{i:02d}_axis"
+            m_axis = AXIStreamInterface(**axis_kwargs)
+            platform.add_extension(m_axis.get_ios(name))
+            comb_stmts += m_axis.connect_to_pads(platform.request(name), mode="master")
             m_axiss.append(m_axis)
         
         # AXIS-INTERCONNECT ----------------------------------------------------------------------------------
@@ -90,34 +105,24 @@ class AXISTREAMINTERCONNECTWrapper(Module):
             )
         
         # Interconnect Control Signal ----------------------------------------------------------------------
-        for m_count in range(m_count+1):
-            platform.add_extension(get_control_ios(select_width, m_count))
-            self.comb += interconnect.select[m_count].eq(platform.request("m{}_select".format(m_count)))
-
-# Build --------------------------------------------------------------------------------------------
-def main():
-    parser = argparse.ArgumentParser(description="AXIS INTERCONNECT CORE")
+        platform.add_extension(get_control_ios(select_width, m_count))
+        for i in range(m_count):
+            comb_stmts.append(interconnect.select[i].eq(platform.request("m{}_select".format(i))))
 
-    # Import Common Modules.
-    common_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib")
-    sys.path.append(common_path)
+        self.comb += comb_stmts
 
-    from common import IP_Builder
+# ------------- Ports       : Dependency
+dep_dict = {
+            "id_width"      : "id_en",
+            "dest_width"    : "dest_en",
+            "user_width"    : "user_en"
+}
 
-    # ------------- Ports       : Dependency
-    dep_dict = {
-                "id_width"      : "id_en",
-                "dest_width"    : "dest_en",
-                "user_width"    : "user_en"
-    }
-    
-    # IP Builder.
-    rs_builder = IP_Builder(device="gemini", ip_name="axis_interconnect", language="verilog")
+# Build --------------------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1)
+def build_parser():
+    parser = argparse.ArgumentParser(description="AXIS INTERCONNECT CORE")
 
-    logging.info("===================================================")
-    logging.info("IP    : %s", rs_builder.ip_name.upper())
-    logging.info(("==================================================="))
-    
     # Core fix value parameters.
     core_fix_param_group = parser.add_argument_group(title="Core fix parameters")
     core_fix_param_group.add_argument("--data_width",      type=int,     default=8,   choices=[8, 16, 32, 64, 128, 256, 512, 1024],   help="Data Width.")
@@ -148,7 +153,23 @@ def main():
     json_group.add_argument("--json",                                           help="Generate Core from JSON File")
     json_group.add_argument("--json-template",  action="store_true",            help="Generate JSON Template")
 
-    args = parser.parse_args()
+    return parser
+
+def main():
+    # IP Builder.
+    rs_builder = IP_Builder(device="gemini", ip_name="axis_interconnect", language="verilog")
+
+    logging.info("===================================================")
+    logging.info("IP    : %s", rs_builder.ip_name.upper())
+    logging.info(("==================================================="))
+
+    # Parse arguments once; JSON values (if any) are pre-loaded as defaults for the command line.
+    parser        = build_parser()
+    json_filename = get_json_filename()
+    if json_filename:
+        args = rs_builder.import_args_from_json(parser=parser, json_filename=json_filename)
+    else:
+        args = parser.parse_args()
     
     details =  {   "IP details": {
     'Name' : 'AXI-Stream Interconnect',
@@ -159,7 +180,6 @@ def main():
 
     # Import JSON (Optional) -----------------------------------------------------------------------
     if args.json:
-        args = rs_builder.import_args_from_json(parser=parser , json_filename=args.json)
         rs_builder.import_ip_details_json(build_dir=args.build_dir ,details=details , build_name = args.build_name, version = "v1_0")
 
         file_path = os.path.dirname(os.path.realpath(__file__))
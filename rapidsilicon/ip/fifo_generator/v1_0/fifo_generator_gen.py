@@ -6,19 +6,38 @@
 
 import os
 import sys
+import json
+import shutil
+import hashlib
 import logging
 import argparse
+import functools
+import importlib.util
+import importlib.metadata
+import concurrent.futures
 from pathlib import Path
 from datetime import datetime
+from typing import NamedTuple
 import math
 
-from litex_wrapper.fifo_litex_generator import *
-
-from migen import *
-
-from litex.build.generic_platform import *
-
-from litex.build.osfpga import OSFPGAPlatform
+# LiteX/Migen are imported lazily (only when a wrapper has to be elaborated) to keep --help and
+# --json-template fast.
+
+# FIFO Configuration -------------------------------------------------------------------------------
+
+class FIFOConfig(NamedTuple):
+    # Hashable generator parameters, also used as the wrapper cache key.
+    data_width_write        : int
+    data_width_read         : int
+    synchronous             : bool
+    full_threshold          : bool
+    empty_threshold         : bool
+    depth                   : int
+    first_word_fall_through : bool
+    empty_value             : int
+    full_value              : int
+    builtin_fifo            : bool
+    addr_width              : int
 
 # Making the read and write data widths into their own buses
 def divide_n_bit_numbers(number):
@@ -39,23 +58,38 @@ def divide_n_bit_numbers(number):
 
 # IOs/Interfaces -----------------------------------------------------------------------------------
 
-def get_clkin_ios(data_width_write, data_width_read):
-    return [
-        ("clk",        0,  Pins(1)),
+@functools.lru_cache(maxsize=None)
+def get_static_ios():
+    # Configuration independent IOs, built once.
+    from litex.build.generic_platform import Pins
+    return (
         ("rst",        0,  Pins(1)),
-		("wrt_clock",  0,  Pins(1)),
-        ("rd_clock",   0,  Pins(1)),
-        ("din",        0,  Pins(data_width_write)),
-        ("dout",       0,  Pins(data_width_read)),
         ("wr_en",      0,  Pins(1)),
         ("rd_en",      0,  Pins(1)),
         ("full",       0,  Pins(1)),
         ("empty",      0,  Pins(1)),
         ("underflow",  0,  Pins(1)),
         ("overflow",   0,  Pins(1)),
-        ("prog_full",  0,  Pins(1)),
-        ("prog_empty", 0,  Pins(1))
-    ]
+    )
+
+@functools.lru_cache(maxsize=128)
+def get_clkin_ios(data_width_write, data_width_read, synchronous, full_threshold, empty_threshold):
+    # Only declare the IOs used by this configuration.
+    from litex.build.generic_platform import Pins
+    ios = get_static_ios() + (
+        ("din",        0,  Pins(data_width_write)),
+        ("dout",       0,  Pins(data_width_read)),
+    )
+    if (synchronous):
+        ios += (("clk",        0,  Pins(1)),)
+    else:
+        ios += (("wrt_clock",  0,  Pins(1)),
+                ("rd_clock",   0,  Pins(1)))
+    if (full_threshold):
+        ios += (("prog_full",  0,  Pins(1)),)
+    if (empty_threshold):
+        ios += (("prog_empty", 0,  Pins(1)),)
+    return ios
 
 # Data Width Read Limitations ---------------------------------------------------------------------
 
@@ -135,97 +169,203 @@ def divide_n_bit_number(number, depth):
     
     return buses
 
+# Argument Types ----------------------------------------------------------------------------------
+
+def str_to_bool(value):
+    # argparse "type=bool" turns any non-empty string (including "False") into True.
+    if value.lower() in ("true", "1", "yes", "on"):
+        return True
+    if value.lower() in ("false", "0", "no", "off"):
+        return False
+    raise argparse.ArgumentTypeError("invalid boolean value: '{}'".format(value))
+
+def bounded_int(low, high):
+    # Check bounds before argparse's choices check, whose error would list every allowed value.
+    def check(value):
+        try:
+            value = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError("invalid int value: '{}'".format(value))
+        if not (low <= value <= high):
+            raise argparse.ArgumentTypeError("{} is out of range (choose from {}..{})".format(value, low, high))
+        return value
+    return check
+
+# Wrapper Cache -----------------------------------------------------------------------------------
+
+def get_package_version(name):
+    # Installed version of a package, without importing it (falls back to its location mtime).
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.origin is None:
+            return "unknown"
+        return "mtime:{}".format(os.stat(spec.origin).st_mtime_ns)
+
+def get_cache_filename(build_name, config):
+    # Key on build name, FIFO configuration, generator sources (this file + LiteX wrapper + common
+    # IP Builder, which writes the wrapper header) and the Migen/LiteX versions emitting the Verilog.
+    sources = [
+        __file__,
+        os.path.join(os.path.dirname(__file__), "litex_wrapper", "fifo_litex_generator.py"),
+        os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib", "common.py"),
+    ]
+    key = hashlib.blake2b(digest_size=16)
+    key.update(repr((build_name, config)).encode())
+    for source in sources:
+        key.update(str(os.stat(source).st_mtime_ns).encode())
+    for package in ["migen", "litex"]:
+        key.update(get_package_version(package).encode())
+    cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "rs_ip", "fifo_generator")
+    return os.path.join(cache_dir, key.hexdigest() + ".v")
+
+def store_cache_file(filename, cache_filename):
+    # Copy to a temporary file first so concurrent builds never see a partial cache entry.
+    # The cache is only an optimization: an unwritable cache directory must not fail the build.
+    tmp_filename = "{}.{}.tmp".format(cache_filename, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+        shutil.copyfile(filename, tmp_filename)
+        os.replace(tmp_filename, cache_filename)
+    except OSError as e:
+        logging.warning("Wrapper not cached (%s)", e)
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
+
 # FIFO Generator ----------------------------------------------------------------------------------
-class FIFOGenerator(Module):
-    def __init__(self, platform, data_width_write, data_width_read, synchronous, full_threshold, empty_threshold, depth, first_word_fall_through, empty_value, full_value, builtin_fifo):
-        # Clocking ---------------------------------------------------------------------------------
-        platform.add_extension(get_clkin_ios(data_width_write, data_width_read))
-        self.clock_domains.cd_sys  = ClockDomain()
-        self.clock_domains.cd_wrt	= ClockDomain()
-        self.clock_domains.cd_rd	= ClockDomain()
-
-        SYNCHRONOUS = {
-            True    :   "SYNCHRONOUS",
-            False   :   "ASYNCHRONOUS"
-        }
-	
-        self.submodules.fifo = fifo = FIFO(data_width_write, data_width_read, SYNCHRONOUS[synchronous], full_threshold, empty_threshold, depth, first_word_fall_through, empty_value, full_value, builtin_fifo)
-    
-        self.comb += fifo.din.eq(platform.request("din"))
-        self.comb += platform.request("dout").eq(fifo.dout)
-        if (full_threshold):
-            self.comb += platform.request("prog_full").eq(fifo.prog_full)
-        if (empty_threshold):
-            self.comb += platform.request("prog_empty").eq(fifo.prog_empty)
-        if(synchronous):
-            self.comb += self.cd_sys.clk.eq(platform.request("clk"))
-        else:
-            self.comb += self.cd_wrt.clk.eq(platform.request("wrt_clock"))
-            self.comb += self.cd_rd.clk.eq(platform.request("rd_clock"))
-        self.comb += self.cd_sys.rst.eq(platform.request("rst"))
-        self.comb += fifo.wren.eq(platform.request("wr_en"))
-        self.comb += fifo.rden.eq(platform.request("rd_en"))   
-        self.comb += platform.request("full").eq(fifo.full)
-        self.comb += platform.request("empty").eq(fifo.empty)
-        self.comb += platform.request("underflow").eq(fifo.underflow)
-        self.comb += platform.request("overflow").eq(fifo.overflow)        
-            
-# Build --------------------------------------------------------------------------------------------
-def main():
-    parser = argparse.ArgumentParser(description="FIFO")
+def build_fifo_generator(platform, config):
+    from migen import Module, ClockDomain
+    from litex_wrapper.fifo_litex_generator import FIFO
+
+    module = Module()
+
+    # Clocking ---------------------------------------------------------------------------------
+    synchronous     = config.synchronous
+    full_threshold  = config.full_threshold
+    empty_threshold = config.empty_threshold
+    platform.add_extension(get_clkin_ios(config.data_width_write, config.data_width_read, synchronous, full_threshold, empty_threshold))
+    # cd_sys is always needed: it clocks the synchronous FIFO and its reset drives the
+    # asynchronous FIFO's write/read domain resets. Write/Read domains are asynchronous only.
+    module.clock_domains.cd_sys  = ClockDomain()
+    if (not synchronous):
+        module.clock_domains.cd_wrt	= ClockDomain()
+        module.clock_domains.cd_rd	= ClockDomain()
+
+    SYNCHRONOUS = {
+        True    :   "SYNCHRONOUS",
+        False   :   "ASYNCHRONOUS"
+    }
+
+    module.submodules.fifo = fifo = FIFO(config.data_width_write, config.data_width_read, SYNCHRONOUS[synchronous], full_threshold, empty_threshold, config.depth, config.first_word_fall_through, config.empty_value, config.full_value, config.builtin_fifo, config.addr_width)
+
+    # Request pads once, in port order, only for the IOs used by this configuration.
+    pad_names = ["din", "dout"]
+    if (full_threshold):
+        pad_names.append("prog_full")
+    if (empty_threshold):
+        pad_names.append("prog_empty")
+    if (synchronous):
+        pad_names.append("clk")
+    else:
+        pad_names += ["wrt_clock", "rd_clock"]
+    pad_names += ["rst", "wr_en", "rd_en", "full", "empty", "underflow", "overflow"]
+    pads = {name: platform.request(name) for name in pad_names}
+
+    comb_stmts = [
+        fifo.din.eq(pads["din"]),
+        pads["dout"].eq(fifo.dout),
+    ]
+    if (full_threshold):
+        comb_stmts.append(pads["prog_full"].eq(fifo.prog_full))
+    if (empty_threshold):
+        comb_stmts.append(pads["prog_empty"].eq(fifo.prog_empty))
+    if(synchronous):
+        comb_stmts.append(module.cd_sys.clk.eq(pads["clk"]))
+    else:
+        comb_stmts.append(module.cd_wrt.clk.eq(pads["wrt_clock"]))
+        comb_stmts.append(module.cd_rd.clk.eq(pads["rd_clock"]))
+    comb_stmts += [
+        module.cd_sys.rst.eq(pads["rst"]),
+        fifo.wren.eq(pads["wr_en"]),
+        fifo.rden.eq(pads["rd_en"]),
+        pads["full"].eq(fifo.full),
+        pads["empty"].eq(fifo.empty),
+        pads["underflow"].eq(fifo.underflow),
+        pads["overflow"].eq(fifo.overflow),
+    ]
+    module.comb += comb_stmts
+
+    return module
 
+# IP Builder ---------------------------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def get_ip_builder(device):
     # Import Common Modules.
-    common_path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib")
-    sys.path.append(common_path)
+    common_path = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "lib"))
+    if common_path not in sys.path:
+        sys.path.append(common_path)
 
     from common import IP_Builder
 
-    # Parameter Dependency dictionary
-    #                Ports     :    Dependency
-    dep_dict = {}            
+    return IP_Builder(device=device, ip_name="fifo_generator", language="verilog")
 
-    # IP Builder.
-    rs_builder = IP_Builder(device="gemini", ip_name="fifo_generator", language="verilog")
+# Build --------------------------------------------------------------------------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(description="FIFO")
 
-    logging.info("===================================================")
-    logging.info("IP    : %s", rs_builder.ip_name.upper())
-    logging.info(("==================================================="))
-    
     # Core range value parameters.
     core_range_param_group = parser.add_argument_group(title="Core range parameters")
     core_fix_param_group = parser.add_argument_group(title="Core fix parameters")
-    core_range_param_group.add_argument("--data_width",         type=int,   default=36,  	choices=range(1,1025),   help="FIFO Write/Read Width")
+    core_range_param_group.add_argument("--data_width",         type=bounded_int(1, 1024),   default=36,  	choices=range(1,1025),   metavar="{1..1024}",     help="FIFO Write/Read Width")
     core_fix_param_group.add_argument("--data_width_write",   type=int,   default=36,  	choices=[9 * 2**i for i in range(7)],   help="FIFO Write Width")
-    core_range_param_group.add_argument("--full_value",         type=int,   default=1000,      choices=range(2,4095),  help="Full Value")
-    core_range_param_group.add_argument("--empty_value",        type=int,   default=20,      choices=range(1,4095),  help="Empty Value")
-    core_range_param_group.add_argument("--depth",              type=int,   default=1024,	choices=range(3,523265), help="FIFO Depth")
+    core_range_param_group.add_argument("--full_value",         type=bounded_int(2, 4094),   default=1000,      choices=range(2,4095),  metavar="{2..4094}",     help="Full Value")
+    core_range_param_group.add_argument("--empty_value",        type=bounded_int(1, 4094),   default=20,      choices=range(1,4095),  metavar="{1..4094}",     help="Empty Value")
+    core_range_param_group.add_argument("--depth",              type=bounded_int(3, 523264),   default=1024,	choices=range(3,523265), metavar="{3..523264}",  help="FIFO Depth")
     core_fix_param_group.add_argument("--write_depth",      type=int,   default=1024,   choices=[2**i for i in range(2, 20) if 2**i <= 523264],   help="FIFO Write Depth")
 
     # Core fix value parameters.
-    core_fix_param_group.add_argument("--data_width_read",  type=int,   default=36,  	choices=[i for i in range(1, 1025)],   help="FIFO Read Width")
+    core_fix_param_group.add_argument("--data_width_read",  type=bounded_int(1, 1024),   default=36,  	choices=range(1, 1025),   metavar="{1..1024}",     help="FIFO Read Width")
     core_fix_param_group.add_argument("--DEPTH",            type=int,   default=1024,   choices=[2**i for i in range(2, 20) if 2**i <= 523264],   help="FIFO Depth")
 
     # Core bool value parameters.
     core_bool_param_group = parser.add_argument_group(title="Core bool parameters")
-    core_bool_param_group.add_argument("--synchronous",             type=bool,   default=True,    help="Synchronous / Asynchronous Clock")
-    core_bool_param_group.add_argument("--first_word_fall_through", type=bool,   default=False,   help="Fist Word Fall Through")
-    core_bool_param_group.add_argument("--full_threshold",          type=bool,   default=False,	  help="Full Threshold")
-    core_bool_param_group.add_argument("--empty_threshold",         type=bool,   default=False,   help="Empty Threshold")
-    core_bool_param_group.add_argument("--builtin_fifo",            type=bool,   default=True,    help="Built-in FIFO or Distributed RAM")
-    core_bool_param_group.add_argument("--asymmetric",              type=bool,   default=False,   help="Asymmetric Data Widths for Read and Write ports.")
+    core_bool_param_group.add_argument("--synchronous",             type=str_to_bool,   default=True,    help="Synchronous / Asynchronous Clock")
+    core_bool_param_group.add_argument("--first_word_fall_through", type=str_to_bool,   default=False,   help="Fist Word Fall Through")
+    core_bool_param_group.add_argument("--full_threshold",          type=str_to_bool,   default=False,	  help="Full Threshold")
+    core_bool_param_group.add_argument("--empty_threshold",         type=str_to_bool,   default=False,   help="Empty Threshold")
+    core_bool_param_group.add_argument("--builtin_fifo",            type=str_to_bool,   default=True,    help="Built-in FIFO or Distributed RAM")
+    core_bool_param_group.add_argument("--asymmetric",              type=str_to_bool,   default=False,   help="Asymmetric Data Widths for Read and Write ports.")
 
     # Build Parameters.
     build_group = parser.add_argument_group(title="Build parameters")
     build_group.add_argument("--build",         action="store_true",    help="Build Core")
     build_group.add_argument("--build-dir",     default="./",           help="Build Directory")
     build_group.add_argument("--build-name",    default="FIFO_generator", help="Build Folder Name, Build RTL File Name and Module Name")
+    build_group.add_argument("--no-cache",      action="store_true",    help="Regenerate Core wrapper instead of reusing the cached one")
+    build_group.add_argument("--server",        action="store_true",    help="Build Core for each JSON argument dict read from stdin (one per line)")
+    build_group.add_argument("--sweep",         default=None,           help="Build Core in parallel for each JSON argument dict of a JSON list file (each with its own build-dir/build-name; IP.log is shared)")
 
     # JSON Import/Template
     json_group = parser.add_argument_group(title="JSON Parameters")
     json_group.add_argument("--json",                                   help="Generate Core from JSON File")
     json_group.add_argument("--json-template",  action="store_true",    help="Generate JSON Template")
 
-    args = parser.parse_args()
+    return parser
+
+def build_one(argv=None):
+    parser = build_parser()
+
+    # Parameter Dependency dictionary
+    #                Ports     :    Dependency
+    dep_dict = {}            
+
+    args = parser.parse_args(argv)
+
+    # IP Builder (loaded after parsing so --help and argument errors never import common).
+    rs_builder = get_ip_builder(device="gemini")
 
     if (args.builtin_fifo == False and args.synchronous == False):
         depth = args.DEPTH
@@ -234,7 +374,7 @@ def main():
         
     # Import JSON (Optional) -----------------------------------------------------------------------
     if args.json:
-        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json)
+        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json, args=argv)
         if (args.asymmetric):
             data_width_read  = args.data_width_read
             data_width_write = args.data_width_write
@@ -281,7 +421,7 @@ def main():
 
     # Import JSON (Optional) -----------------------------------------------------------------------
     if args.json:
-        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json)
+        # args already hold the JSON values (imported above); only re-parse once choices are updated below.
         rs_builder.import_ip_details_json(build_dir=args.build_dir ,details=details , build_name = args.build_name, version = "v1_0")
         file_path = os.path.dirname(os.path.realpath(__file__))
         rs_builder.copy_images(file_path)
@@ -312,7 +452,7 @@ def main():
             if (args.asymmetric):
                 option_strings_to_remove = ['--data_width']
                 parser._actions = [action for action in parser._actions if action.option_strings and action.option_strings[0] not in option_strings_to_remove]
-                if (math.ceil(math.log2(args.depth)) != math.floor(math.log2(args.depth))):
+                if (args.depth & (args.depth - 1)):
                     parser._actions[5].default = 2 ** round(math.log2(args.depth))
                 parser._actions[2].choices = range(2, args.DEPTH)
                 parser._actions[3].choices = range(1, args.DEPTH)
@@ -327,7 +467,7 @@ def main():
                 parser._actions = [action for action in parser._actions if action.option_strings and action.option_strings[0] not in option_strings_to_remove]
                 option_strings_to_remove = ['--data_width_write']
                 parser._actions = [action for action in parser._actions if action.option_strings and action.option_strings[0] not in option_strings_to_remove]
-                if (math.ceil(math.log2(args.depth)) != math.floor(math.log2(args.depth))):
+                if (args.depth & (args.depth - 1)):
                     parser._actions[4].default = 2 ** round(math.log2(args.depth))
                 parser._actions[2].choices = range(2, args.DEPTH)
                 parser._actions[3].choices = range(1, args.DEPTH)
@@ -374,7 +514,7 @@ def main():
                     parser._actions[3].default = 1
                 parser._actions[4].choices = range(2, int(prev_rem/args.data_width) + 1)
         
-        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json)
+        args = rs_builder.import_args_from_json(parser=parser, json_filename=args.json, args=argv)
 
     if (args.builtin_fifo == False and args.synchronous == False):
         depth = args.DEPTH
@@ -420,8 +560,11 @@ def main():
     
     # Export JSON Template (Optional) --------------------------------------------------------------
     if args.json_template:
-        rs_builder.export_json_template(parser=parser, dep_dict=dep_dict, summary=summary)
+        rs_builder.export_json_template(parser=parser, dep_dict=dep_dict, summary=summary, args=argv)
 
+    # Nothing else to do without --build: skip LiteX platform/module construction entirely.
+    if not args.build:
+        return
 
     if (args.asymmetric):
         data_width_read  = args.data_width_read
@@ -430,9 +573,16 @@ def main():
         data_width_read  = args.data_width
         data_width_write = args.data_width
 
-    # Create Generator -------------------------------------------------------------------------------
-    platform = OSFPGAPlatform(io=[], toolchain="raptor", device="gemini")
-    module   = FIFOGenerator(platform,
+    # Build Project --------------------------------------------------------------------------------
+    rs_builder.prepare(
+        build_dir  = args.build_dir,
+        build_name = args.build_name,
+        version    = "v1_0"
+    )
+    rs_builder.copy_files(gen_path=os.path.dirname(__file__))
+    rs_builder.generate_tcl(version    = "v1_0")
+
+    config = FIFOConfig(
         data_width_read   				= data_width_read,
         data_width_write                = data_width_write,
         synchronous     				= args.synchronous,
@@ -442,101 +592,206 @@ def main():
         full_value                      = args.full_value,
         empty_value                     = args.empty_value,
         first_word_fall_through         = args.first_word_fall_through,
-        builtin_fifo                    = args.builtin_fifo
+        builtin_fifo                    = args.builtin_fifo,
+        addr_width                      = (depth - 1).bit_length()
     )
 
-    # Build Project --------------------------------------------------------------------------------
-    if args.build:
-        rs_builder.prepare(
-            build_dir  = args.build_dir,
-            build_name = args.build_name,
-            version    = "v1_0"
-        )
-        rs_builder.copy_files(gen_path=os.path.dirname(__file__))
-        rs_builder.generate_tcl(version    = "v1_0")
+    # Reuse previously generated wrapper when parameters and generator sources are unchanged.
+    wrapper_filename = os.path.join(rs_builder.src_path, rs_builder.build_name + "_" + "v1_0" + ".v")
+    cache_filename   = get_cache_filename(rs_builder.build_name, config)
+    use_cache        = not args.no_cache and os.path.exists(cache_filename)
+    if use_cache:
+        # LiteX wrapper is not imported on a cache hit: configure IP.log the same way it does.
+        logging.basicConfig(filename="IP.log", filemode="w", level=logging.INFO, format='%(levelname)s: %(message)s\n')
+    else:
+        from litex.build.osfpga import OSFPGAPlatform
+        # LiteX wrapper configures IP.log logging on import: import it before logging.
+        import litex_wrapper.fifo_litex_generator
+
+    logging.info("===================================================")
+    logging.info("IP    : %s", rs_builder.ip_name.upper())
+    logging.info(("==================================================="))
+
+    if use_cache:
+        logging.info("Wrapper reused from cache: %s", cache_filename)
+        for name, value in config._asdict().items():
+            logging.info("%s : %s", name.upper(), value)
+        # copyfile: do not inherit cache entry permissions (wrapper is rewritten below).
+        shutil.copyfile(cache_filename, wrapper_filename)
+    else:
+        # Create Generator -------------------------------------------------------------------------
+        platform = OSFPGAPlatform(io=[], toolchain="raptor", device="gemini")
+        module   = build_fifo_generator(platform, config)
         rs_builder.generate_wrapper(
             platform   = platform,
             module     = module,
             version     = "v1_0"
         )
+        store_cache_file(wrapper_filename, cache_filename)
+
+    # IP_ID Parameter
+    now = datetime.now()
+    my_year         = now.year - 2022
+    year            = (bin(my_year)[2:]).zfill(7) # 7-bits  # Removing '0b' prefix = [2:]
+    month           = (bin(now.month)[2:]).zfill(4) # 4-bits
+    day             = (bin(now.day)[2:]).zfill(5) # 5-bits
+    mod_hour        = now.hour % 12 # 12 hours Format
+    hour            = (bin(mod_hour)[2:]).zfill(4) # 4-bits
+    minute          = (bin(now.minute)[2:]).zfill(6) # 6-bits
+    second          = (bin(now.second)[2:]).zfill(6) # 6-bits
+    
+    # Concatenation for IP_ID Parameter
+    ip_id = ("{}{}{}{}{}{}").format(year, day, month, hour, minute, second)
+    ip_id = ("32'h{}").format(hex(int(ip_id,2))[2:])
+    
+    # IP_VERSION parameter
+    #               Base  _  Major _ Minor
+    ip_version = "00000000_00000000_0000000000000001"
+    ip_version = ("32'h{}").format(hex(int(ip_version, 2))[2:])
+    
+    wrapper = os.path.join(args.build_dir, "rapidsilicon", "ip", "fifo_generator", "v1_0", args.build_name, "src",args.build_name + "_" + "v1_0" + ".v")
+    # Patch module header (IP parameters) and insert DEPTH localparam in a single read/write.
+    with open(wrapper, "r") as file:
+        lines = file.readlines()
+    module_line = "module {}".format(args.build_name)
+    for i, line in enumerate(lines):
+        if module_line in line:
+            lines[i] = "module {} #(\n\tparameter IP_TYPE \t\t= \"FIFO\",\n\tparameter IP_VERSION \t= {}, \n\tparameter IP_ID \t\t= {}\n)\n(\n".format(args.build_name, ip_version, ip_id)
+    file_content = "".join(lines)
+    pos = file_content.find(");")
+    if pos != -1:
+        file_content = file_content[:pos + 2] + "\n\nlocalparam DEPTH = {};".format(depth) + file_content[pos + 2:]
+    with open(wrapper, "w") as file:
+        file.write(file_content)
+    
+    build_name = args.build_name.rsplit( ".", 1 )[ 0 ]
+    file = os.path.join(args.build_dir, "rapidsilicon/ip/fifo_generator/v1_0", build_name, "sim/testbench.v")
+    file = Path(file)
+    text = file.read_text()
+    # Apply all testbench substitutions in memory, then write once.
+    replacements = [
+        ("localparam DEPTH = 2048",         "localparam DEPTH = %s" % depth),
+        ("FIFO_generator",                  "%s" % build_name),
+        ("localparam WRITE_WIDTH = 36",     "localparam WRITE_WIDTH = %s" % data_width_write),
+        ("localparam READ_WIDTH = 36",      "localparam READ_WIDTH = %s" % data_width_read),
+    ]
+    if (not args.synchronous):
+        if (args.builtin_fifo):
+            replacements += [
+                ("== mem [i]",              "== mem[i - 2]"),
+                ("mem[i], dout, i",         "mem[i - 2], dout, i - 2"),
+                ("== 0",                    "<= 2"),
+            ]
+        replacements.append(("forever #5 rd_clk = ~rd_clk;", "forever #2.5 rd_clk = ~rd_clk;"))
+    else:
+        replacements += [
+            ("wrt_clock(wrt_clk)",          "clk(wrt_clk)"),
+            (".rd_clock(rd_clk), ",         ""),
+        ]
+    if (not args.builtin_fifo and args.synchronous and not args.first_word_fall_through):
+        replacements += [
+            ("== mem [i]",                  "== mem[i - 1]"),
+            ("mem[i], dout, i",             "mem[i - 1], dout, i - 1"),
+            ("== 0",                        "<= 1"),
+        ]
+    for old, new in replacements:
+        text = text.replace(old, new)
+    file.write_text(text)
+
+# Server -------------------------------------------------------------------------------------------
+def params_to_argv(parser, params):
+    # Convert a JSON argument dict ({"depth": 2048, "build": true, ...}) to command line arguments.
+    actions = {action.dest: action for action in parser._actions}
+    argv = []
+    for name, value in params.items():
+        action = actions.get(name.replace("-", "_"))
+        if action is None or not action.option_strings:
+            parser.error("unrecognized argument: '{}'".format(name))
+        if action.nargs == 0:
+            if value:
+                argv.append(action.option_strings[0])
+        else:
+            argv += [action.option_strings[0], str(value)]
+    return argv
+
+def serve():
+    # Keep one interpreter (LiteX/Migen imports, IP Builder) alive across a sweep of configurations.
+    parser = build_parser()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            build_one(params_to_argv(parser, json.loads(line)))
+        except SystemExit as e:
+            # Argument errors are already reported by argparse; move on to next configuration.
+            if e.code:
+                print("Skipping configuration: {}".format(line), file=sys.stderr)
+        except Exception as e:
+            # Malformed line, missing file, elaboration error...: report it and keep serving.
+            print("Skipping configuration: {} ({}: {})".format(line, type(e).__name__, e), file=sys.stderr)
+        sys.stdout.flush()
+
+def sweep_init():
+    # Pay LiteX/Migen import cost once per worker process.
+    import migen
+    import litex.build.osfpga
+    import litex_wrapper.fifo_litex_generator
+
+def sweep_one(params):
+    try:
+        build_one(params_to_argv(build_parser(), params))
+    except SystemExit as e:
+        if e.code:
+            return "Skipping configuration: {}".format(json.dumps(params))
+    except Exception as e:
+        # Report in parent instead of letting executor.map re-raise and abort the whole sweep.
+        return "Skipping configuration: {} ({}: {})".format(json.dumps(params), type(e).__name__, e)
+    return None
+
+def sweep(sweep_filename):
+    # Build a list of configurations in parallel. Workers share the current directory, so IP.log
+    # (written by the LiteX wrapper of each worker) is truncated/interleaved and not per configuration.
+    with open(sweep_filename) as f:
+        configs = json.load(f)
+
+    # Configurations building to the same directory/name would race on the same output files
+    # (entries without "build" write nothing there).
+    parser = build_parser()
+    targets = {}
+    for i, params in enumerate(configs):
+        if not isinstance(params, dict) or not params.get("build"):
+            continue
+        build_dir  = params.get("build_dir",  params.get("build-dir",  parser.get_default("build_dir")))
+        build_name = params.get("build_name", params.get("build-name", parser.get_default("build_name")))
+        target     = (os.path.abspath(str(build_dir)), str(build_name))
+        if target in targets:
+            parser.error("--sweep: configurations {} and {} both build to {}".format(targets[target], i, os.path.join(*target)))
+        targets[target] = i
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count(), initializer=sweep_init) as executor:
+        for error in executor.map(sweep_one, configs):
+            if error is not None:
+                print(error, file=sys.stderr)
 
-        # IP_ID Parameter
-        now = datetime.datetime.now()
-        my_year         = now.year - 2022
-        year            = (bin(my_year)[2:]).zfill(7) # 7-bits  # Removing '0b' prefix = [2:]
-        month           = (bin(now.month)[2:]).zfill(4) # 4-bits
-        day             = (bin(now.day)[2:]).zfill(5) # 5-bits
-        mod_hour        = now.hour % 12 # 12 hours Format
-        hour            = (bin(mod_hour)[2:]).zfill(4) # 4-bits
-        minute          = (bin(now.minute)[2:]).zfill(6) # 6-bits
-        second          = (bin(now.second)[2:]).zfill(6) # 6-bits
-        
-        # Concatenation for IP_ID Parameter
-        ip_id = ("{}{}{}{}{}{}").format(year, day, month, hour, minute, second)
-        ip_id = ("32'h{}").format(hex(int(ip_id,2))[2:])
-        
-        # IP_VERSION parameter
-        #               Base  _  Major _ Minor
-        ip_version = "00000000_00000000_0000000000000001"
-        ip_version = ("32'h{}").format(hex(int(ip_version, 2))[2:])
-        
-        wrapper = os.path.join(args.build_dir, "rapidsilicon", "ip", "fifo_generator", "v1_0", args.build_name, "src",args.build_name + "_" + "v1_0" + ".v")
-        new_lines = []
-        with open (wrapper, "r") as file:
-            lines = file.readlines()
-            for i, line in enumerate(lines):
-                if ("module {}".format(args.build_name)) in line:
-                    new_lines.append("module {} #(\n\tparameter IP_TYPE \t\t= \"FIFO\",\n\tparameter IP_VERSION \t= {}, \n\tparameter IP_ID \t\t= {}\n)\n(\n".format(args.build_name, ip_version, ip_id))
-                else:
-                    new_lines.append(line)
-                
-        with open(os.path.join(wrapper), "w") as file:
-            file.writelines(new_lines)
-
-        with open(wrapper, "r") as file:
-            file_content = file.read()
-        pos = file_content.find(");")
-        if pos != -1:
-            updated_content = file_content[:pos + 2] + "\n\nlocalparam DEPTH = {};".format(depth) + file_content[pos + 2:]
-
-            # Write the updated content back to the file
-            with open(os.path.join(wrapper), "w") as file:
-                file.write(updated_content)
-        
-        build_name = args.build_name.rsplit( ".", 1 )[ 0 ]
-        file = os.path.join(args.build_dir, "rapidsilicon/ip/fifo_generator/v1_0", build_name, "sim/testbench.v")
-        file = Path(file)
-        text = file.read_text()
-        text = text.replace("localparam DEPTH = 2048", "localparam DEPTH = %s" % depth)
-        file.write_text(text)
-        text = text.replace("FIFO_generator", "%s" % build_name)
-        file.write_text(text)
-        text = text.replace("localparam WRITE_WIDTH = 36", "localparam WRITE_WIDTH = %s" % data_width_write)
-        file.write_text(text)
-        text = text.replace("localparam READ_WIDTH = 36", "localparam READ_WIDTH = %s" % data_width_read)
-        file.write_text(text)
-        if (not args.synchronous):
-            if (args.builtin_fifo):
-                text = text.replace("== mem [i]", "== mem[i - 2]")
-                file.write_text(text)
-                text = text.replace("mem[i], dout, i", "mem[i - 2], dout, i - 2")
-                file.write_text(text)
-                text = text.replace("== 0", "<= 2")
-                file.write_text(text)
-            text = text.replace("forever #5 rd_clk = ~rd_clk;", "forever #2.5 rd_clk = ~rd_clk;")
-            file.write_text(text)
+def main():
+    # Detect server/sweep modes like the full parser would (including unique prefixes, e.g. --serv).
+    mode_parser = argparse.ArgumentParser(add_help=False)
+    mode_parser.add_argument("--server", action="store_true")
+    mode_parser.add_argument("--sweep",  default=None)
+    mode_args, other_args = mode_parser.parse_known_args()
+    if mode_args.server or mode_args.sweep is not None:
+        # Configurations come from stdin/sweep file: other options would be silently ignored.
+        if mode_args.server and mode_args.sweep is not None:
+            mode_parser.error("--server and --sweep are mutually exclusive")
+        if other_args:
+            mode_parser.error("--server/--sweep do not take other options: {}".format(" ".join(other_args)))
+        if mode_args.sweep is not None:
+            sweep(mode_args.sweep)
         else:
-            text = text.replace("wrt_clock(wrt_clk)", "clk(wrt_clk)")
-            file.write_text(text)
-            text = text.replace(".rd_clock(rd_clk), ", "")
-            file.write_text(text)
-        if (not args.builtin_fifo and args.synchronous and not args.first_word_fall_through):
-            text = text.replace("== mem [i]", "== mem[i - 1]")
-            file.write_text(text)
-            text = text.replace("mem[i], dout, i", "mem[i - 1], dout, i - 1")
-            file.write_text(text)
-            text = text.replace("== 0", "<= 1")
-            file.write_text(text)
+            serve()
+    else:
+        build_one()
 
 if __name__ == "__main__":
     main()
@@ -10,7 +10,7 @@ import datetime
 import logging
 import math
 from migen.genlib.fifo import SyncFIFO, AsyncFIFOBuffered
-from migen import *
+from migen import Module, Signal, Instance, Array, C, Cat, If, ClockSignal, ResetSignal, ClockDomainsRenamer
 
 
 # logging.basicConfig(level=logging.INFO)
@@ -71,11 +71,14 @@ def clock_cycles_to_obtain_desired_output(desired_output_size):
 
 # FIFO Generator ---------------------------------------------------------------------------------------
 class FIFO(Module):
-    def __init__(self, data_width_write, data_width_read, synchronous, full_threshold, empty_threshold, depth, first_word_fall_through, empty_value, full_value, builtin_fifo):
+    def __init__(self, data_width_write, data_width_read, synchronous, full_threshold, empty_threshold, depth, first_word_fall_through, empty_value, full_value, builtin_fifo, addr_width=None):
         SYNCHRONOUS = {
             "SYNCHRONOUS"  :   True,
             "ASYNCHRONOUS" :   False
         }
+        # Address Width: ceil(log2(depth)), computed with integer arithmetic when not provided.
+        if addr_width is None:
+            addr_width = (math.ceil(depth) - 1).bit_length()
         self.logger = logging.getLogger("FIFO")
         self.logger.propagate = True
         self.logger.info(f"=================== PARAMETERS ====================")
@@ -152,23 +155,23 @@ class FIFO(Module):
                 self.counter = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 1, reset=0)
                 self.rd_ptr = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 1, reset=0)
             else:
-                self.counter = Signal(math.ceil(math.log2(depth)) + 1, reset=0)
-                self.rd_ptr = Signal(math.ceil(math.log2(depth)) + 1, reset=0)
-            self.wrt_ptr = Signal(math.ceil(math.log2(depth)) + 1, reset=0)
+                self.counter = Signal(addr_width + 1, reset=0)
+                self.rd_ptr = Signal(addr_width + 1, reset=0)
+            self.wrt_ptr = Signal(addr_width + 1, reset=0)
             
         else:
-            starting = ((2**(math.ceil(math.log2(depth)))/2) - depth/2) 
+            starting = ((2**(addr_width)/2) - depth/2) 
             if (data_width_write >= data_width_read):
                 self.rd_ptr = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=int(starting))
                 ending = ((2**(math.ceil(math.log2((data_width_write/data_width_read)*depth)))/2) + ((data_width_write/data_width_read)*depth)/2 - 1) 
             else:
-                ending = ((2**(math.ceil(math.log2(depth)))/2) + (depth)/2 - 1) 
-                self.rd_ptr = Signal(math.ceil(math.log2(depth)) + 2, reset=int(starting))
-            self.wrt_ptr = Signal(math.ceil(math.log2(depth)) + 2, reset=int(starting))
+                ending = ((2**(addr_width)/2) + (depth)/2 - 1) 
+                self.rd_ptr = Signal(addr_width + 2, reset=int(starting))
+            self.wrt_ptr = Signal(addr_width + 2, reset=int(starting))
 
         if (not SYNCHRONOUS[synchronous]):
-            self.wrt_ptr_rd_clk1 = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-            self.wrt_ptr_rd_clk2 = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
+            self.wrt_ptr_rd_clk1 = Signal(addr_width + 2, reset=0)
+            self.wrt_ptr_rd_clk2 = Signal(addr_width + 2, reset=0)
             if (data_width_write >= data_width_read):
                 self.rd_ptr_wrt_clk1 = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=0)
                 self.rd_ptr_wrt_clk2 = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=0)
@@ -176,13 +179,13 @@ class FIFO(Module):
                 self.sync_wrtclk_rdptr_binary = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=0)
                 self.rd_ptr_reg = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=0)
             else:
-                self.rd_ptr_wrt_clk1 = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-                self.rd_ptr_wrt_clk2 = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-                self.gray_encoded_rdptr = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-                self.sync_wrtclk_rdptr_binary = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-                self.rd_ptr_reg = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-            self.gray_encoded_wrtptr = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-            self.sync_rdclk_wrtptr_binary = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
+                self.rd_ptr_wrt_clk1 = Signal(addr_width + 2, reset=0)
+                self.rd_ptr_wrt_clk2 = Signal(addr_width + 2, reset=0)
+                self.gray_encoded_rdptr = Signal(addr_width + 2, reset=0)
+                self.sync_wrtclk_rdptr_binary = Signal(addr_width + 2, reset=0)
+                self.rd_ptr_reg = Signal(addr_width + 2, reset=0)
+            self.gray_encoded_wrtptr = Signal(addr_width + 2, reset=0)
+            self.sync_rdclk_wrtptr_binary = Signal(addr_width + 2, reset=0)
             self.rd_en_flop = Signal()
             self.rd_en_flop1 = Signal()
             self.comb += ResetSignal("wrt").eq(ResetSignal("sys"))
@@ -191,7 +194,7 @@ class FIFO(Module):
                 self.empty_count = Signal(2)
             else:
                 self.empty_count = Signal(math.ceil(math.log2(clocks_for_output)) + 1, reset=0)
-            self.wrt_ptr_reg = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
+            self.wrt_ptr_reg = Signal(addr_width + 2, reset=0)
 
         self.din    = Signal(data_width_write)
         self.dout   = Signal(data_width_read)
@@ -1450,11 +1453,11 @@ class FIFO(Module):
                     self.sync_wrtclk_rdptr_binary_div = Signal(math.ceil(math.log2((data_width_write/data_width_read)*depth)) + 2, reset=0)
                     self.comb += self.sync_wrtclk_rdptr_binary_div.eq((self.sync_wrtclk_rdptr_binary + decimal_to_binary(int(data_width_write/(data_width_write if data_width_write == data_width_read else data_width_read)))) >> (decimal_to_binary(int(data_width_write/(data_width_write if data_width_write == data_width_read else data_width_read)))) << (decimal_to_binary(int(data_width_write/(data_width_write if data_width_write == data_width_read else data_width_read)))))
                 elif (data_width_write < data_width_read):
-                    self.rd_pointer_multiple = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
+                    self.rd_pointer_multiple = Signal(addr_width + 2, reset=0)
                     self.comb += self.rd_pointer_multiple[0: -1].eq(self.rd_ptr[0: -1]*int((data_width_read/data_width_write)/clocks_for_output))
                     self.comb += self.rd_pointer_multiple[-1].eq(self.rd_ptr[-1])
-                    self.rd_ptr_reg_multiple = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
-                    self.sync_wrtclk_rdptr_binary_multiple = Signal(math.ceil(math.log2(depth)) + 2, reset=0)
+                    self.rd_ptr_reg_multiple = Signal(addr_width + 2, reset=0)
+                    self.sync_wrtclk_rdptr_binary_multiple = Signal(addr_width + 2, reset=0)
                     self.comb += self.sync_wrtclk_rdptr_binary_multiple[0: -1].eq(self.sync_wrtclk_rdptr_binary[0: -1]*int((data_width_read/data_width_write)/clocks_for_output))
                     self.comb += self.sync_wrtclk_rdptr_binary_multiple[-1].eq(self.sync_wrtclk_rdptr_binary[-1])
 
@@ -3264,11 +3267,11 @@ class FIFO(Module):
                     self.comb += self.gray_encoded_rdptr[-2].eq(self.rd_ptr[-2])
                     self.comb += self.gray_encoded_rdptr[-1].eq(self.rd_ptr[-1])
                 else:
-                    for i in range(0, math.ceil(math.log2(depth))):
+                    for i in range(0, addr_width):
                         self.comb += self.gray_encoded_rdptr[i].eq(self.rd_ptr[i + 1] ^ self.rd_ptr[i])
                     self.comb += self.gray_encoded_rdptr[-2].eq(self.rd_ptr[-2])
                     self.comb += self.gray_encoded_rdptr[-1].eq(self.rd_ptr[-1])
-                for i in range(0, math.ceil(math.log2(depth))):
+                for i in range(0, addr_width):
                     self.comb += self.gray_encoded_wrtptr[i].eq(self.wrt_ptr[i + 1] ^ self.wrt_ptr[i])
                 self.comb += self.gray_encoded_wrtptr[-2].eq(self.wrt_ptr[-2])
                 self.comb += self.gray_encoded_wrtptr[-1].eq(self.wrt_ptr[-1])
@@ -3284,15 +3287,15 @@ class FIFO(Module):
                         self.comb += self.sync_wrtclk_rdptr_binary[i].eq(expr)
                     self.comb += self.sync_wrtclk_rdptr_binary[-1].eq(self.rd_ptr_wrt_clk2[-1])
                 else:
-                    for i in range(0, math.ceil(math.log2(depth)) + 1):
+                    for i in range(0, addr_width + 1):
                         expr = self.rd_ptr_wrt_clk2[i]
-                        for j in range(i + 1, math.ceil(math.log2(depth)) + 1):
+                        for j in range(i + 1, addr_width + 1):
                             expr ^= self.rd_ptr_wrt_clk2[j]
                         self.comb += self.sync_wrtclk_rdptr_binary[i].eq(expr)
                     self.comb += self.sync_wrtclk_rdptr_binary[-1].eq(self.rd_ptr_wrt_clk2[-1])
-                for i in range(0, math.ceil(math.log2(depth)) + 1):
+                for i in range(0, addr_width + 1):
                     expr = self.wrt_ptr_rd_clk2[i]
-                    for j in range(i + 1, math.ceil(math.log2(depth)) + 1):
+                    for j in range(i + 1, addr_width + 1):
                         expr ^= self.wrt_ptr_rd_clk2[j]
                     self.comb += self.sync_rdclk_wrtptr_binary[i].eq(expr)
                 self.comb += self.sync_rdclk_wrtptr_binary[-1].eq(self.wrt_ptr_rd_clk2[-1])
@@ -3792,11 +3795,11 @@ class FIFO(Module):
                     )
                 ]
                 # Binary to Gray Code----------------------------------------------------------
-                for i in range(0, math.ceil(math.log2(depth))):
+                for i in range(0, addr_width):
                     self.comb += self.gray_encoded_rdptr[i].eq(self.rd_ptr[i + 1] ^ self.rd_ptr[i])
                 self.comb += self.gray_encoded_rdptr[-2].eq(self.rd_ptr[-2])
                 self.comb += self.gray_encoded_rdptr[-1].eq(self.rd_ptr[-1])
-                for i in range(0, math.ceil(math.log2(depth))):
+                for i in range(0, addr_width):
                     self.comb += self.gray_encoded_wrtptr[i].eq(self.wrt_ptr[i + 1] ^ self.wrt_ptr[i])
                 self.comb += self.gray_encoded_wrtptr[-2].eq(self.wrt_ptr[-2])
                 self.comb += self.gray_encoded_wrtptr[-1].eq(self.wrt_ptr[-1])
@@ -3812,15 +3815,15 @@ class FIFO(Module):
                 ]
                 # -----------------------------------------------------------------------------
                 # Gray to Binary --------------------------------------------------------------
-                for i in range(0, math.ceil(math.log2(depth)) + 1):
+                for i in range(0, addr_width + 1):
                     expr = self.rd_ptr_wrt_clk2[i]
-                    for j in range(i + 1, math.ceil(math.log2(depth)) + 1):
+                    for j in range(i + 1, addr_width + 1):
                         expr ^= self.rd_ptr_wrt_clk2[j]
                     self.comb += self.sync_wrtclk_rdptr_binary[i].eq(expr)
                 self.comb += self.sync_wrtclk_rdptr_binary[-1].eq(self.rd_ptr_wrt_clk2[-1])
-                for i in range(0, math.ceil(math.log2(depth)) + 1):
+                for i in range(0, addr_width + 1):
                     expr = self.wrt_ptr_rd_clk2[i]
-                    for j in range(i + 1, math.ceil(math.log2(depth)) + 1):
+                    for j in range(i + 1, addr_width + 1):
                         expr ^= self.wrt_ptr_rd_clk2[j]
                     self.comb += self.sync_rdclk_wrtptr_binary[i].eq(expr)
                 self.comb += self.sync_rdclk_wrtptr_binary[-1].eq(self.wrt_ptr_rd_clk2[-1])
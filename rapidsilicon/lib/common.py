@@ -5,9 +5,23 @@
 # SPDX-License-Identifier: MIT
 
 import os
+import sys
 import json
 import shutil
 import argparse
+import tempfile
+
+# JSON Argument ------------------------------------------------------------------------------------
+
+def get_json_filename(argv=None):
+    # Peek "--json" from command line so JSON values can be loaded before the single parse_args.
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == "--json" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--json="):
+            return arg.split("=", 1)[1]
+    return None
 
 # IP Catalog Builder -------------------------------------------------------------------------------
 
@@ -40,8 +54,15 @@ class IP_Builder:
         self.add_wrapper_text(filename, header, 13)
 
 
+    @staticmethod
+    def get_choices_range(choices):
+        # Bounds of range choices are computed directly, without materializing every value.
+        if isinstance(choices, range):
+            return [min(choices[0], choices[-1]), max(choices[0], choices[-1])]
+        return [min(choices), max(choices)]
+
     # JSON template for GUI parsing
-    def export_json_template(self, parser, dep_dict, summary):
+    def export_json_template(self, parser, dep_dict, summary, args=None):
 
         # Get "core_fix_param_group" group.
         core_fix_param_group = None
@@ -79,7 +100,7 @@ class IP_Builder:
                 break
 
         # Create vars dict of arguments.
-        _args = parser.parse_args()
+        _args = parser.parse_args(args)
         _vars = vars(_args)
 
         # Post Processing of Json
@@ -117,11 +138,10 @@ class IP_Builder:
             if core_range_param_group is not None:
                 for core_action in core_range_param_group._group_actions:
                     if name == core_action.dest:
-                        temp_list = list(core_action.choices)
                         core_param_list.append(
                         {   "parameter"     : str(name),
                             "title"         : str(name.upper()),
-                            "range"         : [min(temp_list),max(temp_list)],
+                            "range"         : self.get_choices_range(core_action.choices),
                             "type"          : str("int"),
                             "default"       : str(core_action.default),
                             "description"   : str(core_action.help),
@@ -185,12 +205,10 @@ class IP_Builder:
         print(json.dumps(param_json, indent=4, default=None))
 
 
-    def import_args_from_json(self, parser, json_filename):
+    def import_args_from_json(self, parser, json_filename, args=None):
         with open(json_filename, "rt") as f:
-            t_args = argparse.Namespace()
-            t_args.__dict__.update(json.load(f))
-            args = parser.parse_args(namespace=t_args)
-        return args
+            t_args = argparse.Namespace(**json.load(f))
+        return parser.parse_args(args, namespace=t_args)
     
     def import_ip_details_json(self, build_dir,details, build_name, version ):
         self.build_name         = build_name
@@ -347,29 +365,28 @@ class IP_Builder:
 
     def generate_wrapper(self, platform, module, version):
         assert self.prepared
-        build_path     = "litex_build"
-        new_name =  self.build_name + "_" + version
-        build_filename = os.path.join(build_path, new_name) + ".v"
-
-        # Build LiteX module.
-        platform.build(module,
-            build_dir    = build_path,
-            build_name   = new_name,
-            run          = False,
-            regular_comb = False
-        )
-
-        # Insert header.
-        self.add_wrapper_header(build_filename)
-
-        # Copy file to destination.
-        shutil.copy(build_filename, self.src_path)
-        
-        # Changing File Extension from .v to .sv
-        if (self.language == "sverilog"):
-            old_wrapper = os.path.join(self.src_path, f'{new_name}.v')
-            new_wrapper = old_wrapper.replace('.v','.sv')
-            os.rename(old_wrapper, new_wrapper)
-
-        # Remove build files.
-        shutil.rmtree(build_path)
+        # Unique scratch directory so concurrent builds (parameter sweeps) do not collide; removed
+        # even when the build fails.
+        with tempfile.TemporaryDirectory(prefix="litex_build_", dir=".") as build_path:
+            new_name =  self.build_name + "_" + version
+            build_filename = os.path.join(build_path, new_name) + ".v"
+
+            # Build LiteX module.
+            platform.build(module,
+                build_dir    = build_path,
+                build_name   = new_name,
+                run          = False,
+                regular_comb = False
+            )
+
+            # Insert header.
+            self.add_wrapper_header(build_filename)
+
+            # Copy file to destination.
+            shutil.copy(build_filename, self.src_path)
+            
+            # Changing File Extension from .v to .sv
+            if (self.language == "sverilog"):
+                old_wrapper = os.path.join(self.src_path, f'{new_name}.v')
+                new_wrapper = old_wrapper.replace('.v','.sv')
+                os.rename(old_wrapper, new_wrapper)